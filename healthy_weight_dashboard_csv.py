@@ -3,10 +3,8 @@ import streamlit as st
 import pandas as pd
 import datetime as dt
 import os
-from io import BytesIO
-from PIL import Image
-import matplotlib.pyplot as plt
-import seaborn as sns
+import csv
+import html
 import uuid
 
 # Optional Cloudinary import (only used if configured)
@@ -49,121 +47,263 @@ if not CLOUDINARY_AVAILABLE:
 # ------------------------------
 DATA_DIR = "data"
 IMAGES_DIR = os.path.join(DATA_DIR, "images")
-os.makedirs(DATA_DIR, exist_ok=True)
-os.makedirs(IMAGES_DIR, exist_ok=True)
 
 MEAL_FILE = os.path.join(DATA_DIR, "meal_logs.csv")
 WEIGHT_FILE = os.path.join(DATA_DIR, "weight_logs.csv")
 HABIT_FILE = os.path.join(DATA_DIR, "habit_logs.csv")
 
+MEAL_HEADERS = ("date","meal","portion","photo_url","food_quality","protein_g","fiber_g","mood_before","mood_after","hunger_before","hunger_after")
+WEIGHT_HEADERS = ("date","weight","waist")
+HABIT_HEADERS = ("date","walk","water","fruit","custom_habit","reflection")
+
+PORTIONS = ["Small", "Medium", "Large"]
+FOOD_QUALITIES = ["Whole food", "Minimally processed", "Ultra-processed"]
+
+def parse_bool(value):
+    return value == "True"
+
+# Per-file read_csv options: fixed categories for the meal selectboxes (fixed so appended rows
+# concat without falling back to object) and real bools for the habit checkboxes
+READ_OPTIONS = {
+    MEAL_FILE: {"dtype": {"portion": pd.CategoricalDtype(PORTIONS), "food_quality": pd.CategoricalDtype(FOOD_QUALITIES)}},
+    HABIT_FILE: {"converters": {"walk": parse_bool, "water": parse_bool, "fruit": parse_bool}},
+}
+
+# Part of load_csv's cache key: persisted frames only know load_csv's own source, so bump this
+# whenever add_date_parts, READ_OPTIONS or the category lists change shape
+SCHEMA_VERSION = 1
+
+# Weight logs only feed the 3- and 12-month charts, so never load more than a year of rows.
+# (Only safe for files without multi-line fields, since rows are located by counting newlines.)
+TAIL_ROWS = {WEIGHT_FILE: 365}
+
 # Ensure CSVs exist with headers
 def ensure_csv(path, headers):
     if not os.path.exists(path):
-        df = pd.DataFrame(columns=headers)
-        df.to_csv(path, index=False)
+        with open(path, "w", newline="") as f:
+            csv.writer(f, lineterminator="\n").writerow(headers)
 
-ensure_csv(MEAL_FILE, ["date","meal","portion","photo_url","food_quality","protein_g","fiber_g","mood_before","mood_after","hunger_before","hunger_after"])
-ensure_csv(WEIGHT_FILE, ["date","weight","waist"])
-ensure_csv(HABIT_FILE, ["date","walk","water","fruit","custom_habit","reflection"])
+# Folders and CSVs only need checking on the first run of a session
+if not st.session_state.get("_fs_ready"):
+    os.makedirs(DATA_DIR, exist_ok=True)
+    os.makedirs(IMAGES_DIR, exist_ok=True)
+    ensure_csv(MEAL_FILE, MEAL_HEADERS)
+    ensure_csv(WEIGHT_FILE, WEIGHT_HEADERS)
+    ensure_csv(HABIT_FILE, HABIT_HEADERS)
+    st.session_state._fs_ready = True
 
-def load_csv(path):
-    df = pd.read_csv(path)
-    if "date" in df.columns and not df.empty:
-        df["date"] = pd.to_datetime(df["date"])
+# Derive the day / weekday / ISO week columns once at load time so charts don't re-parse dates
+def add_date_parts(df):
+    # Header-only files come back with an object "date" column, so coerce it here
+    dates = pd.to_datetime(df["date"])
+    df["date"] = dates
+    df["_day"] = dates.dt.normalize()
+    df["_dow"] = dates.dt.weekday
+    df["_week"] = dates.dt.isocalendar().week.astype("int16")
     return df
 
-def save_csv(df, path):
-    df.to_csv(path, index=False)
+# Cached per (path, mtime): reruns reuse the parsed frame until the file changes on disk.
+# persist="disk" keeps the typed frame across restarts, so a cold start doesn't re-parse the CSV either.
+@st.cache_data(show_spinner=False, persist="disk", max_entries=12)
+def load_csv(path, mtime, tail_rows, schema_version):
+    skiprows = None
+    if tail_rows is not None:
+        # Skip everything but the header and the last tail_rows data rows
+        # (a callable, since pandas turns a list-like skiprows into a set of every skipped index)
+        cutoff = count_lines(path) - tail_rows
+        skiprows = lambda i: 0 < i < cutoff
+    return add_date_parts(pd.read_csv(path, parse_dates=["date"], skiprows=skiprows, **READ_OPTIONS.get(path, {})))
+
+def count_lines(path):
+    with open(path, "rb") as f:
+        return sum(chunk.count(b"\n") for chunk in iter(lambda: f.read(1 << 16), b""))
+
+# Drop only the superseded entry for one file (in memory and on disk); entries for the
+# other files stay valid since the key includes each file's own mtime
+def forget_cached(path, old_mtime):
+    if old_mtime is not None:
+        load_csv.clear(path, old_mtime, TAIL_ROWS.get(path), SCHEMA_VERSION)
+
+# Session state key for each log frame
+LOG_FILES = {"meal_logs": MEAL_FILE, "weight_logs": WEIGHT_FILE, "habit_logs": HABIT_FILE}
+
+# Each session frame remembers the mtime of the file it was read from. A changed mtime means
+# another session (tab, phone, ...) wrote to the file, so reload it; otherwise it's one stat per file.
+def sync_logs():
+    mtimes = st.session_state.setdefault("_mtimes", {})
+    for key, path in LOG_FILES.items():
+        mtime = os.path.getmtime(path)
+        if mtimes.get(key) != mtime:
+            forget_cached(path, mtimes.get(key))
+            st.session_state[key] = load_csv(path, mtime, TAIL_ROWS.get(path), SCHEMA_VERSION)
+            mtimes[key] = mtime
+
+# Append a single row instead of rewriting the whole file, and add the same row to the
+# session's in-memory frame so nothing has to be re-read from disk
+def append_row(path, row, headers, key):
+    mtimes = st.session_state._mtimes
+    # If someone else wrote since we last read, our frame is missing their rows
+    stale = mtimes.get(key) != os.path.getmtime(path)
+    with open(path, "a", newline="") as f:
+        csv.DictWriter(f, fieldnames=headers, lineterminator="\n").writerow(row)
+    forget_cached(path, mtimes.get(key))
+    mtime = os.path.getmtime(path)
+    if stale:
+        frame = load_csv(path, mtime, TAIL_ROWS.get(path), SCHEMA_VERSION)
+    else:
+        new = add_date_parts(pd.DataFrame([row], columns=headers).astype(READ_OPTIONS.get(path, {}).get("dtype", {})))
+        frame = st.session_state[key]
+        frame = new if frame.empty else pd.concat([frame, new], ignore_index=True)
+        if path in TAIL_ROWS:
+            frame = frame.tail(TAIL_ROWS[path]).reset_index(drop=True)
+    st.session_state[key] = frame
+    mtimes[key] = mtime
+
+# Daily protein/fiber totals, keyed on the meal file version the session frame was synced to
+# (the leading underscore tells Streamlit not to hash the frame itself)
+@st.cache_data(show_spinner=False)
+def daily_nutrients(_meal_logs, path, mtime):
+    return _meal_logs.groupby('_day')[['protein_g','fiber_g']].sum().rename_axis('date')
+
+# Frames live in session state and are only re-read when their file changed on disk.
+# The sections below read st.session_state directly since fragment reruns skip this block.
+sync_logs()
+
+THUMB_SIZE = 300  # px; journal entries show thumbnails rather than full-size photos
+
+def thumb_path(path):
+    return os.path.splitext(path)[0] + "_thumb.jpg"
+
+# Local photos get a small JPEG next to the original, made once at upload time
+def save_thumbnail(path):
+    from PIL import Image
+    with Image.open(path) as img:
+        img.thumbnail((THUMB_SIZE, THUMB_SIZE))
+        img.convert("RGB").save(thumb_path(path), "JPEG", optimize=True)
+
+# Cloudinary resizes on the fly from URL transforms, so no second upload is needed
+def cloudinary_thumb(url):
+    return url.replace("/upload/", f"/upload/w_{THUMB_SIZE},q_auto,f_auto/", 1)
 
-# Load data
-meal_logs = load_csv(MEAL_FILE)
-weight_logs = load_csv(WEIGHT_FILE)
-habit_logs = load_csv(HABIT_FILE)
+# Sections are fragments, so a form submit only reruns its own section. A write that other
+# sections read triggers a full rerun instead, carrying its success note (and any error that
+# came up while saving) over to the next run.
+def rerun_with_success(key, message, error=None):
+    st.session_state[key] = (message, error)
+    st.rerun()
+
+def show_success(key):
+    if key in st.session_state:
+        message, error = st.session_state.pop(key)
+        if error:
+            st.error(error)
+        st.success(message)
 
 # ------------------------------
 # 1. CONSISTENT TRACKING WITHOUT OVERLOAD
 # ------------------------------
-st.header("1️⃣ Consistent Tracking Without Overload")
-
-with st.form("meal_form", clear_on_submit=True):
-    meal = st.text_input("Meal / Snack Description")
-    portion = st.selectbox("Portion Estimate", ["Small", "Medium", "Large"])
-    photo = st.file_uploader("Upload Meal Photo (optional)", type=["jpg","jpeg","png"])
-    food_quality = st.selectbox("Food Quality", ["Whole food", "Minimally processed", "Ultra-processed"])
-    protein = st.number_input("Protein intake (g)", min_value=0)
-    fiber = st.number_input("Fiber intake (g)", min_value=0)
-    mood_before = st.text_input("Mood before meal")
-    mood_after = st.text_input("Mood after meal")
-    hunger_before = st.slider("Hunger before meal (1-10)", 1, 10, 5)
-    hunger_after = st.slider("Hunger after meal (1-10)", 1, 10, 5)
-    submitted = st.form_submit_button("Log Meal")
-    if submitted:
-        photo_url = ""
-        if photo is not None:
-            try:
-                img = Image.open(photo)
-                # Save/upload
-                if CLOUDINARY_AVAILABLE:
-                    buffer = BytesIO()
-                    img.save(buffer, format="JPEG")
-                    buffer.seek(0)
-                    upload_result = cloudinary.uploader.upload(buffer)
-                    photo_url = upload_result.get("secure_url", "")
-                else:
-                    fname = f"{uuid.uuid4().hex}.jpg"
-                    local_path = os.path.join(IMAGES_DIR, fname)
-                    img.save(local_path, format="JPEG")
-                    photo_url = local_path
-            except Exception as e:
-                st.error("Could not process image: " + str(e))
-        new_row = {
-            "date": dt.date.today().isoformat(),
-            "meal": meal,
-            "portion": portion,
-            "photo_url": photo_url,
-            "food_quality": food_quality,
-            "protein_g": protein,
-            "fiber_g": fiber,
-            "mood_before": mood_before,
-            "mood_after": mood_after,
-            "hunger_before": hunger_before,
-            "hunger_after": hunger_after
-        }
-        meal_logs = pd.concat([meal_logs, pd.DataFrame([new_row])], ignore_index=True)
-        save_csv(meal_logs, MEAL_FILE)
-        st.success("Meal logged!")
-
-# Daily streak / quick metrics
-st.subheader("Quick logging stats")
-if not meal_logs.empty:
-    unique_days = meal_logs['date'].dt.date.nunique() if "date" in meal_logs.columns else 0
-else:
-    unique_days = 0
-st.metric("Days with logs", unique_days)
+@st.fragment
+def meal_section():
+    st.header("1️⃣ Consistent Tracking Without Overload")
+
+    with st.form("meal_form", clear_on_submit=True):
+        meal = st.text_input("Meal / Snack Description")
+        portion = st.selectbox("Portion Estimate", PORTIONS)
+        photo = st.file_uploader("Upload Meal Photo (optional)", type=["jpg","jpeg","png"])
+        food_quality = st.selectbox("Food Quality", FOOD_QUALITIES)
+        protein = st.number_input("Protein intake (g)", min_value=0)
+        fiber = st.number_input("Fiber intake (g)", min_value=0)
+        mood_before = st.text_input("Mood before meal")
+        mood_after = st.text_input("Mood after meal")
+        hunger_before = st.slider("Hunger before meal (1-10)", 1, 10, 5)
+        hunger_after = st.slider("Hunger after meal (1-10)", 1, 10, 5)
+        submitted = st.form_submit_button("Log Meal")
+        if submitted:
+            photo_url = ""
+            photo_error = None
+            if photo is not None:
+                try:
+                    # Save/upload the original bytes as-is, no decode/re-encode. verify() only
+                    # parses the header, but still rejects files that aren't images.
+                    from PIL import Image
+                    with Image.open(photo) as img:
+                        img.verify()
+                    if CLOUDINARY_AVAILABLE:
+                        upload_result = cloudinary.uploader.upload(photo.getvalue())
+                        photo_url = upload_result.get("secure_url", "")
+                    else:
+                        ext = os.path.splitext(photo.name)[1].lower() or ".jpg"
+                        fname = f"{uuid.uuid4().hex}{ext}"
+                        local_path = os.path.join(IMAGES_DIR, fname)
+                        with open(local_path, "wb") as f:
+                            f.write(photo.getbuffer())
+                        try:
+                            save_thumbnail(local_path)
+                        except Exception:
+                            # Don't leave a file the journal can't render
+                            os.remove(local_path)
+                            raise
+                        photo_url = local_path
+                except Exception as e:
+                    photo_error = "Could not process image: " + str(e)
+            new_row = {
+                "date": dt.date.today().isoformat(),
+                "meal": meal,
+                "portion": portion,
+                "photo_url": photo_url,
+                "food_quality": food_quality,
+                "protein_g": protein,
+                "fiber_g": fiber,
+                "mood_before": mood_before,
+                "mood_after": mood_after,
+                "hunger_before": hunger_before,
+                "hunger_after": hunger_after
+            }
+            append_row(MEAL_FILE, new_row, MEAL_HEADERS, "meal_logs")
+            # Heatmap, journal and nutrient chart all read meal logs
+            rerun_with_success("_meal_logged", "Meal logged!", photo_error)
+        show_success("_meal_logged")
+
+    # Daily streak / quick metrics
+    meal_logs = st.session_state.meal_logs
+    st.subheader("Quick logging stats")
+    if not meal_logs.empty:
+        unique_days = meal_logs['_day'].nunique()
+    else:
+        unique_days = 0
+    st.metric("Days with logs", unique_days)
+
+meal_section()
 
 # ------------------------------
 # 2. SHORT-TERM & LONG-TERM PROGRESS VIEW
 # ------------------------------
-st.header("2️⃣ Short-Term & Long-Term Progress View")
+@st.fragment
+def weight_section():
+    st.header("2️⃣ Short-Term & Long-Term Progress View")
 
-with st.form("weight_form", clear_on_submit=True):
-    weight = st.number_input("Weight (kg)", min_value=0.0, step=0.1)
-    waist = st.number_input("Waist (cm)", min_value=0.0, step=0.1)
-    added = st.form_submit_button("Add Measurement")
-    if added:
-        new_row = {"date": dt.date.today().isoformat(), "weight": weight, "waist": waist}
-        weight_logs = pd.concat([weight_logs, pd.DataFrame([new_row])], ignore_index=True)
-        save_csv(weight_logs, WEIGHT_FILE)
-        st.success("Measurement logged!")
+    with st.form("weight_form", clear_on_submit=True):
+        weight = st.number_input("Weight (kg)", min_value=0.0, step=0.1)
+        waist = st.number_input("Waist (cm)", min_value=0.0, step=0.1)
+        added = st.form_submit_button("Add Measurement")
+        if added:
+            new_row = {"date": dt.date.today().isoformat(), "weight": weight, "waist": waist}
+            append_row(WEIGHT_FILE, new_row, WEIGHT_HEADERS, "weight_logs")
+            # The dashboard shows the last logged weight
+            rerun_with_success("_weight_logged", "Measurement logged!")
+        show_success("_weight_logged")
 
-if not weight_logs.empty:
-    st.subheader("3-Month Trend")
-    st.line_chart(weight_logs.tail(90).set_index("date")[["weight","waist"]])
-    st.subheader("12-Month Trend")
-    st.line_chart(weight_logs.tail(365).set_index("date")[["weight","waist"]])
+    weight_logs = st.session_state.weight_logs
+    if not weight_logs.empty:
+        st.subheader("3-Month Trend")
+        st.line_chart(weight_logs.tail(90).set_index("date")[["weight","waist"]])
+        st.subheader("12-Month Trend")
+        st.line_chart(weight_logs.tail(365).set_index("date")[["weight","waist"]])
 
-st.subheader("Motivation Notes (not saved automatically)")
-motivation = st.text_area("Why am I doing this?")
+    st.subheader("Motivation Notes (not saved automatically)")
+    st.text_area("Why am I doing this?")
+
+weight_section()
 
 # ------------------------------
 # 3. COACHING OR GUIDED TIPS SECTION
@@ -180,75 +320,113 @@ st.sidebar.write("Reflect on progress and set next step.")
 # ------------------------------
 st.header("4️⃣ Multi-Metric Monitoring Dashboard")
 c1,c2,c3,c4,c5 = st.columns(5)
-c1.metric("Weight (last entry)", f"{weight if 'weight' in locals() else 'N/A'}")
+weight_logs = st.session_state.weight_logs
+c1.metric("Weight (last entry)", f"{weight_logs['weight'].iloc[-1] if not weight_logs.empty else 'N/A'}")
 c2.metric("Steps", "N/A")
 c3.metric("Calories", "N/A")
 c4.metric("Nutrient Balance", "N/A")
 c5.metric("Sleep", "N/A")
 
 # Consistency Heatmap
-st.subheader("Consistency Heatmap")
-if not meal_logs.empty:
-    df = meal_logs.copy()
-    df['day'] = pd.to_datetime(df['date']).dt.date
-    df['count'] = 1
-    heat = df.groupby('day')['count'].sum().reset_index()
-    heat['dow'] = pd.to_datetime(heat['day']).dt.weekday
-    heat['week'] = pd.to_datetime(heat['day']).dt.isocalendar().week
-    pivot = heat.pivot(index='dow', columns='week', values='count').fillna(0)
-    fig, ax = plt.subplots(figsize=(10,3))
-    sns.heatmap(pivot, cmap='Greens', cbar=False, linewidths=.5, linecolor='grey')
-    ax.set_yticks(range(7))
-    ax.set_yticklabels(["Mon","Tue","Wed","Thu","Fri","Sat","Sun"], rotation=0)
-    st.pyplot(fig)
-else:
-    st.write("No meal logs yet — log some meals to populate the heatmap.")
+@st.fragment
+def heatmap_section():
+    st.subheader("Consistency Heatmap")
+    meal_logs = st.session_state.meal_logs
+    if not meal_logs.empty:
+        # Vega-Lite spec rendered in the browser; only imported when there is something to plot
+        import altair as alt
+        heat = meal_logs[['_week','_dow']].value_counts().reset_index(name='count')
+        chart = alt.Chart(heat).mark_rect(stroke='grey', strokeWidth=0.5).encode(
+            x=alt.X('_week:O', title='Week'),
+            y=alt.Y('_dow:O', title=None, scale=alt.Scale(domain=list(range(7))),
+                    axis=alt.Axis(labelExpr="['Mon','Tue','Wed','Thu','Fri','Sat','Sun'][datum.value]")),
+            color=alt.Color('count:Q', scale=alt.Scale(scheme='greens'), legend=None),
+            tooltip=[alt.Tooltip('count:Q', title='Meals')],
+        )
+        st.altair_chart(chart, width="stretch")
+    else:
+        st.write("No meal logs yet — log some meals to populate the heatmap.")
+
+heatmap_section()
 
 # ------------------------------
 # 5. MEAL PHOTO JOURNAL
 # ------------------------------
-st.header("5️⃣ Meal Photo Journal")
-if not meal_logs.empty:
-    for _, row in meal_logs[::-1].iterrows():
-        photo_url = row.get("photo_url", "")
-        caption = f"{row.get('meal','')} - {row.get('date','')} ({row.get('portion','')})"
-        if isinstance(photo_url, str) and photo_url.startswith("http"):
-            st.image(photo_url, caption=caption, use_column_width=True)
-        elif isinstance(photo_url, str) and os.path.exists(photo_url):
-            st.image(photo_url, caption=caption, use_column_width=True)
-        else:
-            # no image for this row
-            st.write(caption)
+JOURNAL_RECENT = 20  # entries shown before the "Show older entries" toggle
+
+# One listdir instead of a stat per journal row; the dir mtime changes whenever a photo is saved
+@st.cache_data(ttl=60, show_spinner=False)
+def local_images(path, mtime):
+    return set(os.listdir(path))
+
+def journal_entry(photo_url, caption, local_set):
+    if isinstance(photo_url, str) and photo_url.startswith("http"):
+        # Plain <img> so the browser defers fetching entries that are off-screen
+        st.markdown(
+            f'<img src="{html.escape(cloudinary_thumb(photo_url))}" loading="lazy" width="{THUMB_SIZE}">',
+            unsafe_allow_html=True,
+        )
+        st.caption(caption)
+    elif isinstance(photo_url, str) and os.path.basename(thumb_path(photo_url)) in local_set:
+        st.image(thumb_path(photo_url), caption=caption, width=THUMB_SIZE)
+    elif isinstance(photo_url, str) and os.path.basename(photo_url) in local_set:
+        # photos saved before thumbnails existed
+        st.image(photo_url, caption=caption, width=THUMB_SIZE)
+    else:
+        # no image for this row
+        st.write(caption)
+
+@st.fragment
+def journal_section():
+    st.header("5️⃣ Meal Photo Journal")
+    meal_logs = st.session_state.meal_logs
+    if not meal_logs.empty:
+        # Pull the columns out once and walk them newest-first by index, no reversed copy / iterrows.
+        # Dates are only formatted for the rows actually rendered.
+        urls = meal_logs["photo_url"].to_numpy()
+        meals = meal_logs["meal"].to_numpy()
+        days = meal_logs["_day"].to_numpy()
+        portions = meal_logs["portion"].to_numpy()
+        local_set = local_images(IMAGES_DIR, os.path.getmtime(IMAGES_DIR))
+        recent_start = max(0, len(urls) - JOURNAL_RECENT)
+        # Older entries aren't rendered at all until asked for (a collapsed expander still would be)
+        end = 0 if recent_start and st.toggle(f"Show {recent_start} older entries", key="journal_show_older") else recent_start
+        for i in range(len(urls) - 1, end - 1, -1):
+            caption = f"{meals[i]} - {pd.Timestamp(days[i]).date()} ({portions[i]})"
+            journal_entry(urls[i], caption, local_set)
+
+journal_section()
 
 # ------------------------------
 # NUTRIENT BALANCE CHART
 # ------------------------------
 st.header("🍽 Nutrient Balance (Protein & Fiber)")
+meal_logs = st.session_state.meal_logs
 if not meal_logs.empty:
-    df = meal_logs.copy()
-    df['date'] = pd.to_datetime(df['date'])
-    daily = df.groupby(df['date'].dt.date)[['protein_g','fiber_g']].sum().reset_index()
-    daily = daily.set_index('date')
-    st.bar_chart(daily)
+    st.bar_chart(daily_nutrients(meal_logs, MEAL_FILE, st.session_state._mtimes["meal_logs"]))
 else:
     st.write("No nutrient data yet — log meals with protein/fiber amounts.")
 
 # ------------------------------
 # HABITS & REFLECTION
 # ------------------------------
-st.header("💪 Habit Anchoring & Lifestyle")
-with st.form("habit_form", clear_on_submit=True):
-    habit_walk = st.checkbox("10-min walk")
-    habit_water = st.checkbox("Drink 2L water")
-    habit_fruit = st.checkbox("Eat 2+ servings of fruit")
-    custom_habit = st.text_input("Custom Habit")
-    reflection = st.text_area("Weekly Reflection")
-    saved = st.form_submit_button("Save Habits")
-    if saved:
-        new_row = {"date": dt.date.today().isoformat(), "walk": habit_walk, "water": habit_water, "fruit": habit_fruit, "custom_habit": custom_habit, "reflection": reflection}
-        habit_logs = pd.concat([habit_logs, pd.DataFrame([new_row])], ignore_index=True)
-        save_csv(habit_logs, HABIT_FILE)
-        st.success("Habits saved!")
+@st.fragment
+def habit_section():
+    st.header("💪 Habit Anchoring & Lifestyle")
+    with st.form("habit_form", clear_on_submit=True):
+        habit_walk = st.checkbox("10-min walk")
+        habit_water = st.checkbox("Drink 2L water")
+        habit_fruit = st.checkbox("Eat 2+ servings of fruit")
+        custom_habit = st.text_input("Custom Habit")
+        reflection = st.text_area("Weekly Reflection")
+        saved = st.form_submit_button("Save Habits")
+        if saved:
+            new_row = {"date": dt.date.today().isoformat(), "walk": habit_walk, "water": habit_water, "fruit": habit_fruit, "custom_habit": custom_habit, "reflection": reflection}
+            # Nothing else reads habit logs, so this stays a fragment-only rerun
+            append_row(HABIT_FILE, new_row, HABIT_HEADERS, "habit_logs")
+            st.success("Habits saved!")
+
+habit_section()
 
 st.markdown("---")
 st.caption("Built with ❤️ — Your data is stored as CSV files in the app's `data/` folder. If you want remote image hosting, add Cloudinary keys in Streamlit Secrets.")